@@ -29,6 +29,37 @@ TRANSACTION_TYPES = {
     'FAILED': 'Failed Transaction'
 }
 
+# Bundled function signatures used to decode calldata when no ABI is cached
+KNOWN_FUNCTION_SIGNATURES = [
+    'transfer(address,uint256)',
+    'approve(address,uint256)',
+    'transferFrom(address,address,uint256)',
+    'safeTransferFrom(address,address,uint256)',
+    'safeTransferFrom(address,address,uint256,bytes)',
+    'safeTransferFrom(address,address,uint256,uint256,bytes)',
+    'safeBatchTransferFrom(address,address,uint256[],uint256[],bytes)',
+    'setApprovalForAll(address,bool)',
+    'deposit()',
+    'withdraw(uint256)',
+    'multicall(bytes[])',
+    'multicall(uint256,bytes[])',
+    'execute(bytes,bytes[],uint256)',
+    'swapExactETHForTokens(uint256,address[],address,uint256)',
+    'swapETHForExactTokens(uint256,address[],address,uint256)',
+    'swapExactTokensForETH(uint256,uint256,address[],address,uint256)',
+    'swapTokensForExactETH(uint256,uint256,address[],address,uint256)',
+    'swapExactTokensForTokens(uint256,uint256,address[],address,uint256)',
+    'swapTokensForExactTokens(uint256,uint256,address[],address,uint256)',
+    'addLiquidity(address,address,uint256,uint256,uint256,uint256,address,uint256)',
+    'addLiquidityETH(address,uint256,uint256,uint256,address,uint256)',
+    'removeLiquidity(address,address,uint256,uint256,uint256,address,uint256)',
+    'removeLiquidityETH(address,uint256,uint256,uint256,address,uint256)',
+    'mint(address,uint256)',
+    'burn(uint256)',
+    'claim()',
+    'stake(uint256)',
+]
+
 # CSV Output Configuration
 CSV_COLUMNS = [
     'Transaction Hash',
@@ -40,15 +71,21 @@ CSV_COLUMNS = [
     'Asset Symbol/Name',
     'Token ID',
     'Value/Amount',
-    'Gas Fee (ETH)'
+    'Gas Fee (ETH)',
+    'Method',
+    'Decoded Arguments'
 ]
 
 # File Paths
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 OUTPUT_DIR = os.path.join(DATA_DIR, 'output')
 TEMP_DIR = os.path.join(DATA_DIR, 'temp')
+ABI_CACHE_DIR = os.path.join(DATA_DIR, 'abi')
+JOBS_DIR = os.path.join(DATA_DIR, 'jobs')
 
 # Create necessary directories
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(TEMP_DIR, exist_ok=True)
+os.makedirs(ABI_CACHE_DIR, exist_ok=True)
+os.makedirs(JOBS_DIR, exist_ok=True)
@@ -10,6 +10,7 @@ setup(
         "python-dotenv>=1.0.0",
         "web3>=6.11.1",
         "eth-utils>=2.3.0",
+        "eth-abi>=4.0.0",
     ],
     python_requires=">=3.9",
 ) 
\ No newline at end of file
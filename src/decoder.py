@@ -0,0 +1,246 @@
+import os
+import json
+from typing import List, Dict, Any, Optional, Tuple, Union
+from eth_abi.registry import registry
+from eth_abi.decoding import TupleDecoder, ContextFramesBytesIO
+from eth_utils import function_signature_to_4byte_selector
+from config.config import KNOWN_FUNCTION_SIGNATURES, ABI_CACHE_DIR
+from src.etherscan import ContractNotVerifiedError
+from src.jobs import atomic_write_json
+
+# Suffix of the marker cached for addresses Etherscan has no verified ABI for
+UNVERIFIED_SUFFIX = '.unverified'
+
+
+def _canonical_type(param: Dict[str, Any]) -> str:
+    """Return the canonical ABI type string for an ABI input, expanding tuples."""
+    abi_type = param['type']
+    if abi_type.startswith('tuple'):
+        components = ','.join(_canonical_type(c) for c in param.get('components', []))
+        return f"({components}){abi_type[len('tuple'):]}"
+    return abi_type
+
+
+def _parse_signature(signature: str) -> Tuple[str, List[str]]:
+    """Split a signature like 'transfer(address,uint256)' into name and types."""
+    name, _, args = signature.partition('(')
+    args = args[:-1]
+    types = []
+    depth = 0
+    current = ''
+    for char in args:
+        if char == ',' and depth == 0:
+            types.append(current)
+            current = ''
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        current += char
+    if current:
+        types.append(current)
+    return name, types
+
+
+def _normalize_value(value: Any) -> Any:
+    """Convert decoded ABI values into JSON-friendly Python values."""
+    if isinstance(value, bytes):
+        return '0x' + value.hex()
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    return value
+
+
+class FunctionDecoder:
+    """Decoder for a single function selector, compiled once and reused."""
+    __slots__ = ('selector', 'name', 'signature', 'arg_names', '_decoder')
+
+    def __init__(self, selector: str, name: str, types: List[str], arg_names: List[str]):
+        self.selector = selector
+        self.name = name
+        self.signature = f"{name}({','.join(types)})"
+        self.arg_names = arg_names
+        self._decoder = TupleDecoder(decoders=tuple(registry.get_decoder(t) for t in types))
+
+    def decode(self, calldata: bytes) -> Dict[str, Any]:
+        """Decode calldata (without the 4-byte selector) into named arguments."""
+        values = self._decoder(ContextFramesBytesIO(calldata))
+        return {name: _normalize_value(value) for name, value in zip(self.arg_names, values)}
+
+
+class SelectorIndex:
+    """Index of 4-byte selectors to function definitions from ABIs and known signatures."""
+
+    def __init__(self, signatures: Optional[List[str]] = None, abi_cache_dir: Optional[str] = ABI_CACHE_DIR):
+        self._entries: Dict[str, Tuple[str, List[str], List[str]]] = {}
+        self._decoders: Dict[str, Optional[FunctionDecoder]] = {}
+        self.abi_cache_dir = abi_cache_dir
+
+        for signature in (KNOWN_FUNCTION_SIGNATURES if signatures is None else signatures):
+            self.add_signature(signature)
+        if abi_cache_dir:
+            self.load_cached_abis()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, selector: str) -> bool:
+        return selector.lower() in self._entries
+
+    def _add(self, name: str, types: List[str], arg_names: List[str], overwrite: bool) -> str:
+        selector = '0x' + function_signature_to_4byte_selector(f"{name}({','.join(types)})").hex()
+        if overwrite or selector not in self._entries:
+            self._entries[selector] = (name, types, arg_names)
+            self._decoders.pop(selector, None)
+        return selector
+
+    def add_signature(self, signature: str) -> str:
+        """Add a bare text signature; arguments are named positionally."""
+        name, types = _parse_signature(signature.replace(' ', ''))
+        return self._add(name, types, [f'arg{i}' for i in range(len(types))], overwrite=False)
+
+    def add_abi(self, abi: Union[str, List[Dict[str, Any]]]) -> int:
+        """Add every function in an ABI; ABI entries take precedence over bare signatures."""
+        if isinstance(abi, str):
+            abi = json.loads(abi)
+        if not isinstance(abi, list):
+            raise ValueError("ABI must be a JSON list")
+
+        count = 0
+        for item in abi:
+            if item.get('type', 'function') != 'function':
+                continue
+            inputs = item.get('inputs', [])
+            types = [_canonical_type(param) for param in inputs]
+            arg_names = [param.get('name') or f'arg{i}' for i, param in enumerate(inputs)]
+            self._add(item['name'], types, arg_names, overwrite=True)
+            count += 1
+        return count
+
+    def load_cached_abis(self) -> int:
+        """Load all ABIs from the cache directory into the index."""
+        count = 0
+        for filename in sorted(os.listdir(self.abi_cache_dir)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.abi_cache_dir, filename)) as f:
+                    count += self.add_abi(json.load(f))
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                print(f"Skipping invalid cached ABI {filename}: {str(e)}")
+        return count
+
+    def get_decoder(self, selector: str) -> Optional[FunctionDecoder]:
+        """Get the compiled decoder for a selector, compiling it on first use."""
+        selector = selector.lower()
+        if selector in self._decoders:
+            return self._decoders[selector]
+
+        entry = self._entries.get(selector)
+        decoder = None
+        if entry:
+            name, types, arg_names = entry
+            try:
+                decoder = FunctionDecoder(selector, name, types, arg_names)
+            except Exception as e:
+                print(f"Unable to compile decoder for {name}: {str(e)}")
+        self._decoders[selector] = decoder
+        return decoder
+
+
+class CalldataDecoder:
+    """Decodes the input field of contract interactions using a selector index.
+
+    When an API client is given, the ABI of each contract called with an
+    unknown selector is fetched once, cached to disk and added to the index.
+    Addresses without a verified ABI are cached too, so they are not looked
+    up again; transient failures are not cached and are retried on later pages.
+    """
+
+    def __init__(self, index: Optional[SelectorIndex] = None, api=None):
+        self.index = index if index is not None else SelectorIndex()
+        self.api = api
+        self._registered: set = set()
+
+    def register_contract(self, contract_address: str) -> bool:
+        """Add a contract's ABI to the index, fetching and caching it if needed."""
+        contract_address = contract_address.lower()
+        self._registered.add(contract_address)
+        cache_dir = self.index.abi_cache_dir
+        cache_file = os.path.join(cache_dir, f"{contract_address}.json") if cache_dir else None
+        unverified_file = os.path.join(cache_dir, contract_address + UNVERIFIED_SUFFIX) if cache_dir else None
+
+        if unverified_file and os.path.exists(unverified_file):
+            return False
+
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file) as f:
+                    self.index.add_abi(json.load(f))
+                return True
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                print(f"Ignoring invalid cached ABI for {contract_address}: {str(e)}")
+
+        if self.api is None:
+            return False
+
+        try:
+            abi = json.loads(self.api.get_contract_abi(contract_address))
+            self.index.add_abi(abi)
+        except ContractNotVerifiedError:
+            if unverified_file:
+                atomic_write_json(unverified_file, {'address': contract_address})
+            return False
+        except Exception as e:
+            print(f"Unable to fetch ABI for {contract_address}: {str(e)}")
+            self._registered.discard(contract_address)
+            return False
+
+        if cache_file:
+            atomic_write_json(cache_file, abi)
+        return True
+
+    def decode_input(self, input_data: str) -> Optional[Dict[str, Any]]:
+        """Decode a single hex-encoded input field."""
+        return self.decode_page([{'input': input_data}])[0]
+
+    def _decode_rows(self, transactions: List[Dict[str, Any]], rows: List[int],
+                     results: List[Optional[Dict[str, Any]]]) -> None:
+        """Decode the given rows, grouped by selector, and record the results."""
+        by_selector: Dict[str, List[int]] = {}
+        for i in rows:
+            by_selector.setdefault(transactions[i]['input'][:10].lower(), []).append(i)
+
+        for selector, selector_rows in by_selector.items():
+            decoder = self.index.get_decoder(selector)
+            if decoder is None:
+                continue
+            for i in selector_rows:
+                tx = transactions[i]
+                try:
+                    args = decoder.decode(bytes.fromhex(tx['input'][10:]))
+                except Exception:
+                    continue
+                tx['methodName'] = decoder.name
+                tx['decodedArgs'] = args
+                results[i] = {'method': decoder.name, 'signature': decoder.signature, 'args': args}
+
+    def decode_page(self, transactions: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Decode the input field of a page of transactions in batch.
+
+        Rows are grouped by selector so each compiled decoder is looked up once
+        per page. Decoded rows are annotated with 'methodName' and 'decodedArgs'.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(transactions)
+        rows = [i for i, tx in enumerate(transactions) if len(tx.get('input') or '0x') >= 10]
+        self._decode_rows(transactions, rows, results)
+
+        if self.api is not None:
+            # Fetch ABIs for contracts not seen before and retry only their rows
+            pending = [i for i in rows if results[i] is None and transactions[i].get('to')]
+            contracts = {transactions[i]['to'].lower() for i in pending} - self._registered
+            if contracts and any([self.register_contract(c) for c in sorted(contracts)]):
+                self._decode_rows(transactions, pending, results)
+
+        return results
@@ -1,7 +1,10 @@
 import requests
 import time
 from typing import List, Dict, Any
-from config.config import ETHERSCAN_API_KEY, ETHERSCAN_API_URL
+from config.config import ETHERSCAN_API_KEY, ETHERSCAN_API_URL, MAX_RETRIES
+
+class ContractNotVerifiedError(Exception):
+    """Raised when Etherscan has no verified source, and so no ABI, for an address."""
 
 class EtherscanAPI:
     def __init__(self):
@@ -9,20 +12,33 @@ class EtherscanAPI:
         self.base_url = ETHERSCAN_API_URL
         self.rate_limit_delay = 0.2  # 200ms delay between requests
 
-    def _make_request(self, module: str, action: str, **params) -> Dict[str, Any]:
-        """Make a request to the Etherscan API with rate limiting."""
-        params.update({
+    def _make_request(self, module: str, action: str, retry_count: int = 0, **params) -> Dict[str, Any]:
+        """Make a request to the Etherscan API with rate limiting and retries."""
+        request_params = dict(params)
+        request_params.update({
             'module': module,
             'action': action,
             'apikey': self.api_key
         })
         
-        time.sleep(self.rate_limit_delay)  # Rate limiting
-        response = requests.get(self.base_url, params=params)
-        response.raise_for_status()
+        try:
+            time.sleep(self.rate_limit_delay)  # Rate limiting
+            response = requests.get(self.base_url, params=request_params)
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException:
+            if retry_count < MAX_RETRIES:
+                time.sleep(self.rate_limit_delay * 2)
+                return self._make_request(module, action, retry_count + 1, **params)
+            raise
         
-        data = response.json()
         if data['status'] == '0' and data['message'] != 'No transactions found':
+            result = data.get('result')
+            if isinstance(result, str) and 'not verified' in result.lower():
+                raise ContractNotVerifiedError(result)
+            if retry_count < MAX_RETRIES:
+                time.sleep(self.rate_limit_delay * 2)
+                return self._make_request(module, action, retry_count + 1, **params)
             raise Exception(f"Etherscan API error: {data['message']}")
         
         return data
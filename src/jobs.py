@@ -0,0 +1,165 @@
+import os
+import json
+import shutil
+import uuid
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from config.config import JOBS_DIR
+
+JOB_FILE = 'job.json'
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Write JSON so readers only ever see the old or the new file, never a partial one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Persist the rename itself
+    dir_fd = os.open(os.path.dirname(path), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def new_cursor() -> Dict[str, Any]:
+    """Return the cursor for a category that has not been fetched yet."""
+    return {
+        'page': 1,
+        'end_block': 99999999,
+        'block_mode': False,
+        'pages': 0,
+        'done': False
+    }
+
+
+class Job:
+    """A single tracker run with its own work directory and durable fetch cursors."""
+
+    def __init__(self, job_id: str, address: str, jobs_dir: str = JOBS_DIR):
+        self.job_id = job_id
+        self.address = address
+        self.work_dir = os.path.join(jobs_dir, job_id)
+        self.pages_dir = os.path.join(self.work_dir, 'pages')
+        self.batch_dir = os.path.join(self.work_dir, 'batches')
+        self.state = {
+            'job_id': job_id,
+            'address': address,
+            'status': 'running',
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'output_file': None,
+            'cursors': {}
+        }
+
+    @classmethod
+    def create(cls, address: str, jobs_dir: str = JOBS_DIR) -> 'Job':
+        """Create a new job with a fresh ID and work directory."""
+        job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        job = cls(job_id, address, jobs_dir)
+        os.makedirs(job.pages_dir, exist_ok=True)
+        os.makedirs(job.batch_dir, exist_ok=True)
+        job.save()
+        return job
+
+    @classmethod
+    def load(cls, job_id: str, jobs_dir: str = JOBS_DIR) -> 'Job':
+        """Load an existing job from its work directory."""
+        with open(os.path.join(jobs_dir, job_id, JOB_FILE)) as f:
+            state = json.load(f)
+        job = cls(job_id, state['address'], jobs_dir)
+        job.state = state
+        if state['status'] == 'running':
+            os.makedirs(job.pages_dir, exist_ok=True)
+            os.makedirs(job.batch_dir, exist_ok=True)
+        return job
+
+    @classmethod
+    def find_resumable(cls, address: str, jobs_dir: str = JOBS_DIR) -> Optional['Job']:
+        """Return the most recent unfinished job for an address, if any."""
+        if not os.path.isdir(jobs_dir):
+            return None
+
+        for job_id in sorted(os.listdir(jobs_dir), reverse=True):
+            job_file = os.path.join(jobs_dir, job_id, JOB_FILE)
+            if not os.path.exists(job_file):
+                continue
+            try:
+                with open(job_file) as f:
+                    state = json.load(f)
+            except ValueError:
+                continue
+            if state.get('address') == address and state.get('status') == 'running':
+                return cls.load(job_id, jobs_dir)
+        return None
+
+    @classmethod
+    def open(cls, address: str, job_id: Optional[str] = None, jobs_dir: str = JOBS_DIR,
+             new: bool = False) -> 'Job':
+        """Load the given job, resume the latest unfinished one, or start a new one.
+
+        With new=True a fresh job is always created, ignoring unfinished ones.
+        """
+        if job_id:
+            if not os.path.exists(os.path.join(jobs_dir, job_id, JOB_FILE)):
+                raise ValueError(f"Job {job_id} not found")
+            job = cls.load(job_id, jobs_dir)
+            if job.address.lower() != address.lower():
+                raise ValueError(f"Job {job_id} belongs to address {job.address}, not {address}")
+            if job.state['status'] != 'running':
+                raise ValueError(f"Job {job_id} is {job.state['status']} and cannot be resumed")
+            return job
+        if new:
+            return cls.create(address, jobs_dir)
+        return cls.find_resumable(address, jobs_dir) or cls.create(address, jobs_dir)
+
+    def save(self) -> None:
+        """Durably write the job state."""
+        atomic_write_json(os.path.join(self.work_dir, JOB_FILE), self.state)
+
+    def get_cursor(self, category: str) -> Dict[str, Any]:
+        """Get the last committed cursor for a category."""
+        return dict(self.state['cursors'].get(category, new_cursor()))
+
+    def _page_path(self, category: str, sequence: int) -> str:
+        return os.path.join(self.pages_dir, f"{category}_{sequence:06d}.json")
+
+    def commit_page(self, category: str, batch: List[Dict[str, Any]], cursor: Dict[str, Any]) -> None:
+        """Durably store a fetched page and then advance the category cursor.
+
+        The page is written before the cursor, so a crash in between only
+        causes the same page to be fetched and overwritten on resume.
+        """
+        sequence = self.state['cursors'].get(category, new_cursor())['pages']
+        atomic_write_json(self._page_path(category, sequence), batch)
+
+        cursor = dict(cursor)
+        cursor['pages'] = sequence + 1
+        self.state['cursors'][category] = cursor
+        self.save()
+
+    def complete_category(self, category: str) -> None:
+        """Mark a category as fully fetched."""
+        cursor = self.get_cursor(category)
+        cursor['done'] = True
+        self.state['cursors'][category] = cursor
+        self.save()
+
+    def load_pages(self, category: str) -> List[Dict[str, Any]]:
+        """Load all committed pages for a category."""
+        transactions = []
+        for sequence in range(self.get_cursor(category)['pages']):
+            with open(self._page_path(category, sequence)) as f:
+                transactions.extend(json.load(f))
+        return transactions
+
+    def complete(self, output_file: Optional[str] = None) -> None:
+        """Mark the job finished and remove its intermediate files."""
+        self.state['status'] = 'completed'
+        self.state['output_file'] = output_file
+        self.save()
+        shutil.rmtree(self.pages_dir, ignore_errors=True)
+        shutil.rmtree(self.batch_dir, ignore_errors=True)
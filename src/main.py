@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import time
+import tempfile
 import requests
 from datetime import datetime
 import pandas as pd
@@ -21,16 +22,29 @@ from config.config import (
     RATE_LIMIT_DELAY,
     BATCH_SIZE
 )
+from src.decoder import CalldataDecoder
+from src.etherscan import EtherscanAPI
+from src.jobs import Job, new_cursor
+from src.tx_index import TransactionIndex
 
 class TransactionTracker:
-    def __init__(self, address):
+    def __init__(self, address, job_id=None, new_job=False):
         self.address = to_checksum_address(address)
         self.transactions = []
         self.is_large_address = False
         self.transaction_count = 0
+        self.decoder = CalldataDecoder(api=EtherscanAPI())
+        self.index = TransactionIndex(self.address)
+        self.job_id = job_id
+        self.new_job = new_job
+        self.job = None
 
     def make_api_request(self, url, params, retry_count=0):
-        """Make API request with retry logic and rate limiting."""
+        """Make API request with retry logic and rate limiting.
+        
+        Returns an empty list when there are no more transactions and None
+        when the request still fails after all retries.
+        """
         try:
             time.sleep(RATE_LIMIT_DELAY)
             response = requests.get(url, params=params)
@@ -39,47 +53,74 @@ class TransactionTracker:
             
             if data['status'] == '1':
                 return data['result']
+            elif data['message'] == 'No transactions found':
+                return []
             elif data['message'] == 'NOTOK' and retry_count < MAX_RETRIES:
                 print(f"API error, retrying... (attempt {retry_count + 1}/{MAX_RETRIES})")
                 time.sleep(RATE_LIMIT_DELAY * 2)
                 return self.make_api_request(url, params, retry_count + 1)
             else:
                 print(f"Error: {data['message']}")
-                return []
+                return None
         except Exception as e:
             if retry_count < MAX_RETRIES:
                 print(f"Request failed, retrying... (attempt {retry_count + 1}/{MAX_RETRIES})")
                 time.sleep(RATE_LIMIT_DELAY * 2)
                 return self.make_api_request(url, params, retry_count + 1)
             print(f"Error fetching data: {str(e)}")
-            return []
+            return None
+
+    def prepare_batch(self, batch, tx_type):
+        """Tag a fetched page with its type and decode contract calldata in batch."""
+        for tx in batch:
+            tx['tx_type'] = tx_type
+        if tx_type == 'EXTERNAL':
+            self.decoder.decode_page(batch)
 
     def fetch_transactions(self, action, tx_type):
-        """Fetch transactions with pagination."""
-        transactions = []
-        page = 1
+        """Fetch transactions with pagination, checkpointing each page to the job."""
         offset = 1000  # Reduced from 5000 to handle pagination better
         
+        if self.job:
+            cursor = self.job.get_cursor(tx_type)
+            transactions = self.index.add_page(self.job.load_pages(tx_type), tx_type)
+            if transactions:
+                print(f"Resumed {len(transactions)} {tx_type} transactions from job {self.job.job_id}")
+                if len(transactions) > 10000:
+                    self.is_large_address = True
+            if cursor['done']:
+                print(f"Using {tx_type} transactions checkpointed by job {self.job.job_id} "
+                      f"(started {self.job.state['created_at']}); run with --new to fetch fresh data")
+                return transactions
+        else:
+            cursor = new_cursor()
+            transactions = []
+        
         while True:
             params = {
                 'module': 'account',
                 'action': action,
                 'address': self.address,
                 'startblock': 0,
-                'endblock': 99999999,
-                'page': page,
+                'endblock': cursor['end_block'],
+                'page': cursor['page'],
                 'offset': offset,
                 'sort': 'desc',
                 'apikey': ETHERSCAN_API_KEY
             }
             
             batch = self.make_api_request(ETHERSCAN_API_URL, params)
+            if batch is None:
+                # Leave the last committed cursor in place so a rerun resumes here
+                raise RuntimeError(f"Fetching {tx_type} transactions failed after {MAX_RETRIES} retries")
             if not batch:
                 break
                 
-            for tx in batch:
-                tx['tx_type'] = tx_type
-            transactions.extend(batch)
+            # Drop rows already seen from overlapping windows before decoding
+            overlap_block = cursor['end_block'] if cursor['block_mode'] and cursor['page'] == 1 else None
+            new_rows = self.index.add_page(batch, tx_type, overlap_block)
+            self.prepare_batch(new_rows, tx_type)
+            transactions.extend(new_rows)
             
             print(f"Fetched {len(transactions)} {tx_type} transactions...")
             
@@ -89,46 +130,54 @@ class TransactionTracker:
                 print("Large address detected. Switching to batch processing mode...")
             
             # If we got less than the offset, we've reached the end
-            if len(batch) < offset:
-                break
+            finished = len(batch) < offset
             
-            # Check if we've hit the Etherscan limit
-            if page * offset >= 10000:
-                print(f"Reached Etherscan's pagination limit for {tx_type} transactions.")
-                print("Switching to block-based pagination...")
-                
-                # Get the last block number from the current batch
-                last_block = int(batch[-1]['blockNumber'])
-                
-                # Continue fetching with block-based pagination
-                while True:
-                    params['startblock'] = last_block + 1
-                    params['page'] = 1  # Reset page number
-                    
-                    batch = self.make_api_request(ETHERSCAN_API_URL, params)
-                    if not batch:
-                        break
-                        
-                    for tx in batch:
-                        tx['tx_type'] = tx_type
-                    transactions.extend(batch)
-                    
-                    print(f"Fetched {len(transactions)} {tx_type} transactions...")
-                    
-                    if len(batch) < offset:
-                        break
-                    
-                    last_block = int(batch[-1]['blockNumber'])
+            # Results are sorted newest first, so the last block in the batch is
+            # the oldest seen. Block windows end there (inclusive) and rows in that
+            # block that were already fetched are dropped by the index.
+            last_block = int(batch[-1]['blockNumber'])
+            if cursor['block_mode']:
+                if last_block == cursor['end_block']:
+                    cursor['page'] += 1  # A single block filled the page
+                else:
+                    cursor['end_block'] = last_block
+                    cursor['page'] = 1
+            elif cursor['page'] * offset >= 10000:
+                # Check if we've hit the Etherscan limit
+                if not finished:
+                    print(f"Reached Etherscan's pagination limit for {tx_type} transactions.")
+                    print("Switching to block-based pagination...")
                 
-                break
+                # Continue from the last block number in the current batch
+                cursor['block_mode'] = True
+                cursor['end_block'] = last_block
+                cursor['page'] = 1  # Reset page number
+            else:
+                cursor['page'] += 1
+            
+            if self.job:
+                self.job.commit_page(tx_type, new_rows, cursor)
             
-            page += 1
+            if finished:
+                break
+        
+        if self.job:
+            self.job.complete_category(tx_type)
         
         return transactions
 
+    def start_job(self):
+        """Open the job for this run, resuming an unfinished one when possible."""
+        if self.job is None:
+            self.job = Job.open(self.address, self.job_id, new=self.new_job)
+            self.job_id = self.job.job_id
+            print(f"Using job {self.job_id} (work directory: {self.job.work_dir})")
+        return self.job
+
     def get_all_transactions(self):
         """Fetch all types of transactions."""
         print(f"Fetching transactions for address: {self.address}")
+        self.start_job()
         
         # Fetch different types of transactions
         self.transactions.extend(self.fetch_transactions('txlist', 'EXTERNAL'))
@@ -157,7 +206,9 @@ class TransactionTracker:
                 'Asset Symbol/Name': 'ETH',
                 'Token ID': '',
                 'Value/Amount': float(tx['value']) / 1e18,
-                'Gas Fee (ETH)': float(tx.get('gasPrice', 0)) * float(tx.get('gasUsed', 0)) / 1e18
+                'Gas Fee (ETH)': float(tx.get('gasPrice', 0)) * float(tx.get('gasUsed', 0)) / 1e18 if self.index.pays_gas(tx) else 0.0,
+                'Method': tx.get('methodName', ''),
+                'Decoded Arguments': json.dumps(tx['decodedArgs'], default=str) if 'decodedArgs' in tx else ''
             }
             
             if tx_type == 'ERC20':
@@ -203,6 +254,9 @@ class TransactionTracker:
         processed_data = []
         total_batches = (self.transaction_count + BATCH_SIZE - 1) // BATCH_SIZE
         
+        # Keep batch files isolated per run so unrelated runs are never merged
+        batch_dir = self.job.batch_dir if self.job else tempfile.mkdtemp(dir=TEMP_DIR)
+        
         for i in range(0, self.transaction_count, BATCH_SIZE):
             batch = self.transactions[i:i + BATCH_SIZE]
             print(f"Processing batch {i//BATCH_SIZE + 1}/{total_batches}")
@@ -214,17 +268,19 @@ class TransactionTracker:
             
             # Save batch to temporary file
             if processed_data:
-                batch_file = os.path.join(TEMP_DIR, f'batch_{i//BATCH_SIZE}.csv')
+                batch_file = os.path.join(batch_dir, f'batch_{i//BATCH_SIZE}.csv')
                 df = pd.DataFrame(processed_data, columns=CSV_COLUMNS)
                 df.to_csv(batch_file, index=False)
                 processed_data = []  # Clear memory
         
-        return TEMP_DIR
+        return batch_dir
 
     def save_transactions(self, data):
         """Save processed transactions to CSV."""
         if not data:
             print("No transactions to save.")
+            if self.job:
+                self.job.complete(None)
             return
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -238,6 +294,9 @@ class TransactionTracker:
             df = df.sort_values('Date & Time', ascending=False)
             df.to_csv(output_file, index=False)
         
+        if self.job:
+            self.job.complete(output_file)
+        
         print(f"Transactions saved to: {output_file}")
 
     def merge_csv_files(self, temp_dir, output_file):
@@ -258,17 +317,31 @@ class TransactionTracker:
         # Clean up temporary files
         for f in all_files:
             os.remove(f)
+        os.rmdir(temp_dir)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <ethereum_address>")
+    args = sys.argv[1:]
+    new_job = '--new' in args
+    args = [arg for arg in args if arg != '--new']
+    if len(args) not in (1, 2) or (new_job and len(args) == 2):
+        print("Usage: python main.py <ethereum_address> [job_id | --new]")
         sys.exit(1)
     
-    address = sys.argv[1]
-    tracker = TransactionTracker(address)
+    address = args[0]
+    job_id = args[1] if len(args) == 2 else None
+    tracker = TransactionTracker(address, job_id, new_job)
     
     # Get and process transactions
-    tracker.get_all_transactions()
+    try:
+        tracker.get_all_transactions()
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"Error: {str(e)}")
+        if tracker.job:
+            print(f"Progress is saved; rerun to resume job {tracker.job.job_id}")
+        sys.exit(1)
     processed_data = tracker.process_transactions()
     tracker.save_transactions(processed_data)
 
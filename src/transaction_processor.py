@@ -1,11 +1,14 @@
-from typing import List, Dict, Any
+import json
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from web3 import Web3
 from config.config import TRANSACTION_TYPES
+from src.decoder import CalldataDecoder
 
 class TransactionProcessor:
-    def __init__(self):
+    def __init__(self, decoder: Optional[CalldataDecoder] = None):
         self.w3 = Web3()
+        self.decoder = decoder if decoder is not None else CalldataDecoder()
 
     def process_normal_transaction(self, tx: Dict[str, Any]) -> Dict[str, Any]:
         """Process a normal ETH transaction."""
@@ -19,7 +22,8 @@ class TransactionProcessor:
             'Asset Symbol/Name': 'ETH',
             'Token ID': '',
             'Value/Amount': self.w3.from_wei(int(tx['value']), 'ether'),
-            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether')
+            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether'),
+            **self._method_fields(tx)
         }
 
     def process_internal_transaction(self, tx: Dict[str, Any]) -> Dict[str, Any]:
@@ -34,7 +38,8 @@ class TransactionProcessor:
             'Asset Symbol/Name': 'ETH',
             'Token ID': '',
             'Value/Amount': self.w3.from_wei(int(tx['value']), 'ether'),
-            'Gas Fee (ETH)': '0'  # Internal transactions don't have gas fees
+            'Gas Fee (ETH)': '0',  # Internal transactions don't have gas fees
+            **self._method_fields(tx)
         }
 
     def process_erc20_transfer(self, tx: Dict[str, Any]) -> Dict[str, Any]:
@@ -49,7 +54,8 @@ class TransactionProcessor:
             'Asset Symbol/Name': tx['tokenSymbol'],
             'Token ID': '',
             'Value/Amount': int(tx['value']) / (10 ** int(tx['tokenDecimal'])),
-            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether')
+            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether'),
+            **self._method_fields(tx)
         }
 
     def process_erc721_transfer(self, tx: Dict[str, Any]) -> Dict[str, Any]:
@@ -64,7 +70,8 @@ class TransactionProcessor:
             'Asset Symbol/Name': tx['tokenName'],
             'Token ID': tx['tokenID'],
             'Value/Amount': '1',  # NFTs are always 1 unit
-            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether')
+            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether'),
+            **self._method_fields(tx)
         }
 
     def process_erc1155_transfer(self, tx: Dict[str, Any]) -> Dict[str, Any]:
@@ -79,11 +86,22 @@ class TransactionProcessor:
             'Asset Symbol/Name': tx['tokenName'],
             'Token ID': tx['tokenID'],
             'Value/Amount': tx['tokenValue'],
-            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether')
+            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether'),
+            **self._method_fields(tx)
         }
 
     def process_contract_interaction(self, tx: Dict[str, Any]) -> Dict[str, Any]:
         """Process a contract interaction transaction."""
+        self.decoder.decode_page([tx])
+        return self._contract_interaction_row(tx)
+
+    def process_contract_interactions(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process a page of contract interactions, decoding their input in batch."""
+        self.decoder.decode_page(transactions)
+        return [self._contract_interaction_row(tx) for tx in transactions]
+
+    def _contract_interaction_row(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the row for a contract interaction whose input was already decoded."""
         return {
             'Transaction Hash': tx['hash'],
             'Date & Time': datetime.fromtimestamp(int(tx['timeStamp'])).strftime('%Y-%m-%d %H:%M:%S'),
@@ -94,5 +112,13 @@ class TransactionProcessor:
             'Asset Symbol/Name': 'Contract Interaction',
             'Token ID': '',
             'Value/Amount': self.w3.from_wei(int(tx['value']), 'ether'),
-            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether')
+            'Gas Fee (ETH)': self.w3.from_wei(int(tx['gasPrice']) * int(tx['gasUsed']), 'ether'),
+            **self._method_fields(tx)
+        }
+
+    def _method_fields(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the decoded method columns for a row, empty when not decoded."""
+        return {
+            'Method': tx.get('methodName', ''),
+            'Decoded Arguments': json.dumps(tx['decodedArgs'], default=str) if 'decodedArgs' in tx else ''
         }
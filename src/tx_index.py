@@ -0,0 +1,107 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+# Fields that, with the hash, identify a row within each category
+ROW_KEY_FIELDS = {
+    'EXTERNAL': (),
+    'INTERNAL': ('traceId', 'from', 'to', 'value'),
+    'ERC20': ('logIndex', 'contractAddress', 'from', 'to', 'value'),
+    'ERC721': ('logIndex', 'contractAddress', 'from', 'to', 'tokenID'),
+    'ERC1155': ('logIndex', 'contractAddress', 'from', 'to', 'tokenID', 'tokenValue'),
+}
+
+
+class _Entry:
+    """Rows sharing one transaction hash."""
+    __slots__ = ('parent', 'children', 'child_counts')
+
+    def __init__(self):
+        self.parent: Optional[Dict[str, Any]] = None
+        self.children: Optional[List[Dict[str, Any]]] = None
+        self.child_counts: Optional[Dict[Tuple[Any, ...], int]] = None
+
+
+class TransactionIndex:
+    """Hash index over an address's fetched rows, built as pages stream in.
+
+    External transactions are parents; internal and token transfers sharing
+    their hash are children. Each hash is stored once; children are counted
+    per identifying fields on their entry. A new block window repeats the
+    rows of its boundary block, so only rows in that block are checked
+    against earlier pages. Identical transfers within one transaction, such
+    as a multicall paying the address twice, are all kept.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self._entries: Dict[str, _Entry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, tx_hash: str) -> bool:
+        return tx_hash.lower() in self._entries
+
+    @staticmethod
+    def _child_key(tx: Dict[str, Any], tx_type: str) -> Tuple[Any, ...]:
+        fields = ROW_KEY_FIELDS.get(tx_type, ('from', 'to', 'value'))
+        return (tx_type,) + tuple(tx.get(f, '') for f in fields)
+
+    def add_page(self, batch: List[Dict[str, Any]], tx_type: str,
+                 overlap_block: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Index a page of rows and return only the rows not seen before.
+
+        overlap_block is the block shared with the previous window, if any.
+        The n-th identical row from that block is dropped when n identical
+        rows were already indexed.
+        """
+        new_rows = []
+        page_counts: Dict[Tuple[Any, ...], int] = {}
+        for tx in batch:
+            tx_hash = tx['hash'].lower()
+            entry = self._entries.get(tx_hash)
+            if entry is None:
+                entry = self._entries[tx_hash] = _Entry()
+
+            if tx_type == 'EXTERNAL':
+                if entry.parent is not None:
+                    continue
+                entry.parent = tx
+            else:
+                key = self._child_key(tx, tx_type)
+                if entry.child_counts is None:
+                    entry.child_counts = {}
+                    entry.children = []
+                seen = entry.child_counts.get(key, 0)
+                if overlap_block is not None and int(tx.get('blockNumber', -1)) == overlap_block:
+                    occurrence = page_counts.get((tx_hash,) + key, 0)
+                    page_counts[(tx_hash,) + key] = occurrence + 1
+                    if occurrence < seen:
+                        continue
+                entry.child_counts[key] = seen + 1
+                entry.children.append(tx)
+            new_rows.append(tx)
+        return new_rows
+
+    def get_parent(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the external transaction for a hash, if it was fetched."""
+        entry = self._entries.get(tx_hash.lower())
+        return entry.parent if entry else None
+
+    def get_children(self, tx_hash: str) -> List[Dict[str, Any]]:
+        """Get the internal and token transfers that belong to a hash."""
+        entry = self._entries.get(tx_hash.lower())
+        return list(entry.children) if entry and entry.children else []
+
+    def pays_gas(self, tx: Dict[str, Any]) -> bool:
+        """Whether the transaction's gas should be attributed to this row.
+
+        Gas is attributed once per hash, to the external transaction, and only
+        when the tracked address sent it. Transfers without a fetched parent
+        were sent by someone else, so the address paid no gas for them. Rows
+        that were never indexed keep their own gas.
+        """
+        entry = self._entries.get(tx['hash'].lower())
+        if entry is None:
+            return True
+        parent = entry.parent
+        return parent is tx and parent.get('from', '').lower() == self.address.lower()
@@ -0,0 +1,138 @@
+import json
+import pytest
+from unittest.mock import Mock, patch
+from src.decoder import SelectorIndex, CalldataDecoder
+from src.etherscan import ContractNotVerifiedError
+from src.transaction_processor import TransactionProcessor
+
+RECIPIENT = '0x000000000000000000000000000000000000dead'
+
+# transfer(0x...dead, 1000)
+TRANSFER_INPUT = (
+    '0xa9059cbb'
+    '000000000000000000000000000000000000000000000000000000000000dead'
+    '00000000000000000000000000000000000000000000000000000000000003e8'
+)
+
+SAMPLE_ABI = [
+    {
+        'type': 'function',
+        'name': 'transfer',
+        'inputs': [
+            {'name': 'to', 'type': 'address'},
+            {'name': 'amount', 'type': 'uint256'}
+        ]
+    },
+    {'type': 'event', 'name': 'Transfer', 'inputs': []}
+]
+
+@pytest.fixture
+def index(tmp_path):
+    return SelectorIndex(abi_cache_dir=str(tmp_path))
+
+def test_known_signature_decoding(index):
+    """Test decoding with the bundled signature table"""
+    decoder = CalldataDecoder(index)
+    result = decoder.decode_input(TRANSFER_INPUT)
+    assert result['method'] == 'transfer'
+    assert result['signature'] == 'transfer(address,uint256)'
+    assert result['args'] == {'arg0': RECIPIENT, 'arg1': 1000}
+
+def test_abi_overrides_signature_names(index):
+    """Test ABI entries replace positional argument names"""
+    assert index.add_abi(json.dumps(SAMPLE_ABI)) == 1
+    result = CalldataDecoder(index).decode_input(TRANSFER_INPUT)
+    assert result['args'] == {'to': RECIPIENT, 'amount': 1000}
+
+def test_decoder_compiled_once(index):
+    """Test a selector's decoder is compiled once and reused"""
+    assert index.get_decoder('0xa9059cbb') is index.get_decoder('0xA9059CBB')
+    assert index.get_decoder('0xdeadbeef') is None
+
+def test_decode_page(index):
+    """Test batch decoding annotates decodable rows only"""
+    page = [
+        {'input': TRANSFER_INPUT},
+        {'input': '0x'},
+        {'input': '0xdeadbeef'},
+        {'input': '0xa9059cbb00'},
+    ]
+    results = CalldataDecoder(index).decode_page(page)
+    assert results[0]['method'] == 'transfer'
+    assert results[1:] == [None, None, None]
+    assert page[0]['methodName'] == 'transfer'
+    assert page[0]['decodedArgs']['arg1'] == 1000
+    assert 'methodName' not in page[3]
+
+def test_register_contract_caches_abi(index, tmp_path):
+    """Test fetched ABIs are cached and reloaded from disk"""
+    api = Mock()
+    api.get_contract_abi.return_value = json.dumps(SAMPLE_ABI)
+    decoder = CalldataDecoder(index, api=api)
+
+    assert decoder.register_contract('0xABC') is True
+    assert (tmp_path / '0xabc.json').exists()
+
+    reloaded = SelectorIndex(signatures=[], abi_cache_dir=str(tmp_path))
+    result = CalldataDecoder(reloaded).decode_input(TRANSFER_INPUT)
+    assert result['args']['to'] == RECIPIENT
+
+def test_register_contract_unverified(index, tmp_path):
+    """Test unverified contracts are cached and not looked up again"""
+    api = Mock()
+    api.get_contract_abi.side_effect = ContractNotVerifiedError('Contract source code not verified')
+    assert CalldataDecoder(index, api=api).register_contract('0xabc') is False
+    assert (tmp_path / '0xabc.unverified').exists()
+
+    # A later run skips the address without a request
+    assert CalldataDecoder(index, api=api).register_contract('0xabc') is False
+    api.get_contract_abi.assert_called_once()
+
+def test_register_contract_transient_failure(index, tmp_path):
+    """Test transient lookup failures are not cached and are retried"""
+    api = Mock()
+    api.get_contract_abi.side_effect = [Exception('Max rate limit reached'), json.dumps(SAMPLE_ABI)]
+    decoder = CalldataDecoder(index, api=api)
+    page = [{'input': '0xdeadbeef', 'to': '0xabc'}]
+
+    decoder.decode_page(page)
+    assert not (tmp_path / '0xabc.unverified').exists()
+    decoder.decode_page(page)
+    assert api.get_contract_abi.call_count == 2
+    assert (tmp_path / '0xabc.json').exists()
+
+def test_decode_page_fetches_unknown_contract_abi(tmp_path):
+    """Test contracts called with unknown selectors have their ABI fetched once"""
+    index = SelectorIndex(signatures=[], abi_cache_dir=str(tmp_path))
+    api = Mock()
+    api.get_contract_abi.return_value = json.dumps(SAMPLE_ABI)
+    decoder = CalldataDecoder(index, api=api)
+
+    page = [{'input': TRANSFER_INPUT, 'to': '0xToken'} for _ in range(3)]
+    results = decoder.decode_page(page)
+    assert all(result['args']['to'] == RECIPIENT for result in results)
+    assert (tmp_path / '0xtoken.json').exists()
+
+    decoder.decode_page([{'input': '0xdeadbeef', 'to': '0xtoken'}])
+    api.get_contract_abi.assert_called_once_with('0xtoken')
+
+def test_invalid_cached_abi_skipped(tmp_path):
+    """Test cached ABI files that are not lists are ignored"""
+    (tmp_path / '0xabc.json').write_text('{"not": "a list"}')
+    index = SelectorIndex(abi_cache_dir=str(tmp_path))
+    assert CalldataDecoder(index).register_contract('0xabc') is False
+
+def test_processor_decodes_page_once(index):
+    """Test batch processing does not re-decode undecodable rows"""
+    decoder = CalldataDecoder(index)
+    processor = TransactionProcessor(decoder)
+    page = [
+        {'hash': f'0x{n}', 'timeStamp': '1625097600', 'from': '0xabc', 'to': '0xdef',
+         'value': '0', 'gasPrice': '1', 'gasUsed': '1', 'input': '0xdeadbeef'}
+        for n in range(3)
+    ]
+    with patch.object(decoder, 'decode_page', wraps=decoder.decode_page) as mock_decode:
+        rows = processor.process_contract_interactions(page)
+    assert mock_decode.call_count == 1
+    assert [row['Method'] for row in rows] == ['', '', '']
+    assert rows[0]['Asset Symbol/Name'] == 'Contract Interaction'
@@ -0,0 +1,32 @@
+import pytest
+from unittest.mock import Mock, patch
+from src.etherscan import EtherscanAPI, ContractNotVerifiedError
+
+def make_response(status, message, result):
+    response = Mock()
+    response.json.return_value = {'status': status, 'message': message, 'result': result}
+    return response
+
+@pytest.fixture
+def api():
+    api = EtherscanAPI()
+    api.rate_limit_delay = 0
+    return api
+
+@patch('requests.get')
+def test_get_contract_abi_unverified(mock_get, api):
+    """Test unverified contracts raise a dedicated error without retrying"""
+    mock_get.return_value = make_response('0', 'NOTOK', 'Contract source code not verified')
+    with pytest.raises(ContractNotVerifiedError):
+        api.get_contract_abi('0xabc')
+    assert mock_get.call_count == 1
+
+@patch('requests.get')
+def test_make_request_retries_rate_limit(mock_get, api):
+    """Test rate limit errors are retried"""
+    mock_get.side_effect = [
+        make_response('0', 'NOTOK', 'Max rate limit reached'),
+        make_response('1', 'OK', '[]')
+    ]
+    assert api.get_contract_abi('0xabc') == '[]'
+    assert mock_get.call_count == 2
@@ -0,0 +1,174 @@
+import os
+import pytest
+from unittest.mock import patch
+from src.jobs import Job
+from src.main import TransactionTracker
+
+ADDRESS = '0x000000000000000000000000000000000000dEaD'
+
+def make_page(start, size):
+    return [
+        {'hash': f'0x{n:x}', 'blockNumber': str(n), 'timeStamp': '1625097600', 'input': '0x'}
+        for n in range(start, start + size)
+    ]
+
+@pytest.fixture
+def jobs_dir(tmp_path):
+    return str(tmp_path)
+
+def test_job_commit_and_resume(jobs_dir):
+    """Test committed pages and cursors survive reloading a job"""
+    job = Job.create(ADDRESS, jobs_dir)
+    job.commit_page('EXTERNAL', make_page(0, 2), {'page': 2, 'end_block': 99999999, 'block_mode': False, 'done': False})
+
+    resumed = Job.find_resumable(ADDRESS, jobs_dir)
+    assert resumed.job_id == job.job_id
+    assert resumed.get_cursor('EXTERNAL')['page'] == 2
+    assert resumed.get_cursor('EXTERNAL')['pages'] == 1
+    assert len(resumed.load_pages('EXTERNAL')) == 2
+    assert resumed.get_cursor('INTERNAL')['page'] == 1
+
+def test_job_complete(jobs_dir):
+    """Test completed jobs are not resumed and their pages are removed"""
+    job = Job.create(ADDRESS, jobs_dir)
+    job.commit_page('EXTERNAL', make_page(0, 1), job.get_cursor('EXTERNAL'))
+    job.complete('out.csv')
+
+    assert not os.path.exists(job.pages_dir)
+    assert Job.find_resumable(ADDRESS, jobs_dir) is None
+    assert Job.load(job.job_id, jobs_dir).state['output_file'] == 'out.csv'
+
+def test_job_open_rejects_other_address(jobs_dir):
+    """Test an explicit job ID must belong to the tracked address"""
+    other = Job.create('0xother', jobs_dir)
+    with pytest.raises(ValueError):
+        Job.open(ADDRESS, other.job_id, jobs_dir)
+
+def test_job_open_rejects_unknown_job(jobs_dir):
+    """Test a mistyped job ID is reported as not found"""
+    with pytest.raises(ValueError, match='not found'):
+        Job.open(ADDRESS, '20240101_000000_missing', jobs_dir)
+
+def test_job_open_new_skips_unfinished_job(jobs_dir):
+    """Test a fresh job can be forced even when one is unfinished"""
+    unfinished = Job.create(ADDRESS, jobs_dir)
+    assert Job.open(ADDRESS, jobs_dir=jobs_dir).job_id == unfinished.job_id
+    assert Job.open(ADDRESS, jobs_dir=jobs_dir, new=True).job_id != unfinished.job_id
+
+def test_job_open_rejects_completed_job(jobs_dir):
+    """Test a completed job cannot be resumed by ID"""
+    job = Job.create(ADDRESS, jobs_dir)
+    job.commit_page('EXTERNAL', make_page(0, 1), job.get_cursor('EXTERNAL'))
+    job.complete('out.csv')
+    with pytest.raises(ValueError):
+        Job.open(ADDRESS, job.job_id, jobs_dir)
+
+def test_job_open_isolated_per_address(jobs_dir):
+    """Test jobs for other addresses are not resumed"""
+    Job.create('0xother', jobs_dir)
+    job = Job.open(ADDRESS, jobs_dir=jobs_dir)
+    assert job.address == ADDRESS
+    assert len(os.listdir(jobs_dir)) == 2
+
+def test_fetch_resumes_from_last_page(jobs_dir):
+    """Test a restarted fetch continues from the last committed page"""
+    pages = [make_page(0, 1000), make_page(1000, 1000), make_page(2000, 10)]
+
+    tracker = TransactionTracker(ADDRESS)
+    tracker.job = Job.create(ADDRESS, jobs_dir)
+    with patch.object(TransactionTracker, 'make_api_request', side_effect=[pages[0], Exception('crash')]):
+        with pytest.raises(Exception):
+            tracker.fetch_transactions('txlist', 'EXTERNAL')
+
+    restarted = TransactionTracker(ADDRESS, tracker.job.job_id)
+    restarted.job = Job.load(tracker.job.job_id, jobs_dir)
+    with patch.object(TransactionTracker, 'make_api_request', side_effect=pages[1:]) as mock_request:
+        transactions = restarted.fetch_transactions('txlist', 'EXTERNAL')
+
+    assert len(transactions) == 2010
+    assert [call.args[1]['page'] for call in mock_request.call_args_list] == [2, 3]
+    assert restarted.job.get_cursor('EXTERNAL')['done'] is True
+
+    # A completed category is served entirely from the checkpoint
+    finished = TransactionTracker(ADDRESS)
+    finished.job = Job.load(tracker.job.job_id, jobs_dir)
+    with patch.object(TransactionTracker, 'make_api_request') as mock_request:
+        assert len(finished.fetch_transactions('txlist', 'EXTERNAL')) == 2010
+        mock_request.assert_not_called()
+
+def test_empty_address_completes_job(jobs_dir):
+    """Test a run with no transactions does not leave a resumable job behind"""
+    tracker = TransactionTracker(ADDRESS)
+    tracker.job = Job.create(ADDRESS, jobs_dir)
+    with patch.object(TransactionTracker, 'make_api_request', return_value=[]):
+        tracker.get_all_transactions()
+    tracker.save_transactions(tracker.process_transactions())
+
+    assert tracker.job.state['status'] == 'completed'
+    assert Job.find_resumable(ADDRESS, jobs_dir) is None
+
+def test_fetch_beyond_pagination_limit(jobs_dir):
+    """Test block-based pagination reaches history older than the first 10,000 rows"""
+    # 12,000 rows, three per block, returned newest first like Etherscan
+    history = [
+        {'hash': f'0x{n:x}', 'blockNumber': str(n // 3), 'timeStamp': '1625097600', 'input': '0x'}
+        for n in reversed(range(12000))
+    ]
+
+    def fake_request(url, params):
+        rows = [tx for tx in history if params['startblock'] <= int(tx['blockNumber']) <= params['endblock']]
+        start = (params['page'] - 1) * params['offset']
+        if start + params['offset'] > 10000:
+            return []
+        return rows[start:start + params['offset']]
+
+    tracker = TransactionTracker(ADDRESS)
+    tracker.job = Job.create(ADDRESS, jobs_dir)
+    with patch.object(TransactionTracker, 'make_api_request', side_effect=fake_request):
+        transactions = tracker.fetch_transactions('txlist', 'EXTERNAL')
+
+    assert len(transactions) == 12000
+    assert {tx['hash'] for tx in transactions} == {tx['hash'] for tx in history}
+    assert tracker.is_large_address is True
+
+def test_failed_request_keeps_cursor(jobs_dir):
+    """Test exhausted retries stop the run without marking the category done"""
+    tracker = TransactionTracker(ADDRESS)
+    tracker.job = Job.create(ADDRESS, jobs_dir)
+    with patch.object(TransactionTracker, 'make_api_request', side_effect=[make_page(0, 1000), None]):
+        with pytest.raises(RuntimeError):
+            tracker.fetch_transactions('txlist', 'EXTERNAL')
+
+    cursor = Job.load(tracker.job.job_id, jobs_dir).get_cursor('EXTERNAL')
+    assert cursor['page'] == 2
+    assert cursor['pages'] == 1
+    assert cursor['done'] is False
+
+@patch('requests.get')
+def test_make_api_request_end_of_data(mock_get):
+    """Test an empty result is told apart from a failed request"""
+    mock_get.return_value.json.return_value = {'status': '0', 'message': 'No transactions found', 'result': []}
+    assert TransactionTracker(ADDRESS).make_api_request('https://api.etherscan.io/api', {}) == []
+
+def test_fetch_beyond_pagination_limit_keeps_identical_transfers(jobs_dir):
+    """Test identical transfers survive the block window overlap"""
+    # 6,000 transactions, each paying the address twice with identical transfers
+    history = [
+        {'hash': f'0x{n // 2:x}', 'blockNumber': str(n // 6), 'timeStamp': '1625097600',
+         'contractAddress': '0xusdc', 'from': '0xpool', 'to': ADDRESS, 'value': '1'}
+        for n in reversed(range(12000))
+    ]
+
+    def fake_request(url, params):
+        rows = [tx for tx in history if params['startblock'] <= int(tx['blockNumber']) <= params['endblock']]
+        start = (params['page'] - 1) * params['offset']
+        if start + params['offset'] > 10000:
+            return []
+        return rows[start:start + params['offset']]
+
+    tracker = TransactionTracker(ADDRESS)
+    tracker.job = Job.create(ADDRESS, jobs_dir)
+    with patch.object(TransactionTracker, 'make_api_request', side_effect=fake_request):
+        transactions = tracker.fetch_transactions('tokentx', 'ERC20')
+
+    assert len(transactions) == 12000
@@ -67,7 +67,7 @@ def test_make_api_request_failure(mock_get, tracker):
     """Test failed API request"""
     mock_get.side_effect = Exception('API Error')
     result = tracker.make_api_request('https://api.etherscan.io/api', {'module': 'account'})
-    assert result == []
+    assert result is None
 
 def test_process_transaction_normal(tracker):
     """Test processing a normal ETH transaction"""
@@ -139,4 +139,17 @@ def test_large_address_detection(tracker):
     # Process transactions
     tracker.process_transactions()
     
-    assert tracker.is_large_address is True 
\ No newline at end of file
+    assert tracker.is_large_address is True
+
+
+def test_gas_attributed_once_per_hash():
+    """Test related rows sharing a hash only count gas once"""
+    address = '0x000000000000000000000000000000000000dEaD'
+    tracker = TransactionTracker(address)
+    parent = dict(SAMPLE_TRANSACTION, **{'from': address})
+    child = dict(SAMPLE_ERC20_TRANSACTION, hash='0x123')
+    tracker.index.add_page([parent], 'EXTERNAL')
+    tracker.index.add_page([child], 'ERC20')
+
+    assert tracker.process_transaction(parent)['Gas Fee (ETH)'] == 0.00042
+    assert tracker.process_transaction(child)['Gas Fee (ETH)'] == 0.0
@@ -0,0 +1,62 @@
+from src.tx_index import TransactionIndex
+
+ADDRESS = '0x000000000000000000000000000000000000dEaD'
+
+PARENT = {'hash': '0xAA', 'from': ADDRESS, 'to': '0xrouter', 'value': '0'}
+INTERNAL = {'hash': '0xaa', 'traceId': '0_1', 'from': '0xrouter', 'to': ADDRESS, 'value': '5'}
+TOKEN = {'hash': '0xaa', 'blockNumber': '100', 'logIndex': '3', 'contractAddress': '0xusdc', 'from': '0xpool', 'to': ADDRESS, 'value': '7'}
+
+def test_links_children_to_parent():
+    """Test transfers are linked to their external transaction by hash"""
+    index = TransactionIndex(ADDRESS)
+    index.add_page([PARENT], 'EXTERNAL')
+    index.add_page([INTERNAL], 'INTERNAL')
+    index.add_page([TOKEN], 'ERC20')
+
+    assert len(index) == 1
+    assert index.get_parent('0xaa') is PARENT
+    assert index.get_children('0xAA') == [INTERNAL, TOKEN]
+
+def test_deduplicates_overlapping_pages():
+    """Test rows repeated by an overlapping window's boundary block are dropped"""
+    index = TransactionIndex(ADDRESS)
+    assert index.add_page([PARENT], 'EXTERNAL') == [PARENT]
+    assert index.add_page([dict(PARENT), {'hash': '0xbb'}], 'EXTERNAL') == [{'hash': '0xbb'}]
+    assert index.add_page([TOKEN], 'ERC20') == [TOKEN]
+
+    older = dict(TOKEN, hash='0xdd', blockNumber='99')
+    assert index.add_page([dict(TOKEN), older], 'ERC20', overlap_block=100) == [older]
+
+def test_keeps_identical_transfers_in_one_page():
+    """Test identical transfers within one transaction are not merged"""
+    index = TransactionIndex(ADDRESS)
+    repeat = dict(TOKEN)
+    assert index.add_page([TOKEN, repeat], 'ERC20') == [TOKEN, repeat]
+    assert index.get_children('0xaa') == [TOKEN, repeat]
+
+    # The next window repeats both, then a third identical transfer
+    third = dict(TOKEN)
+    assert index.add_page([dict(TOKEN), dict(TOKEN), third], 'ERC20', overlap_block=100) == [third]
+
+def test_gas_attributed_once():
+    """Test gas goes only to a parent sent by the tracked address"""
+    index = TransactionIndex(ADDRESS)
+    index.add_page([TOKEN], 'ERC20')
+    second = dict(TOKEN, logIndex='9')
+    index.add_page([second], 'ERC20')
+
+    # Transfers without a parent were sent by someone else
+    assert index.pays_gas(TOKEN) is False
+    assert index.pays_gas(second) is False
+
+    index.add_page([PARENT], 'EXTERNAL')
+    assert index.pays_gas(PARENT) is True
+    assert index.pays_gas(TOKEN) is False
+
+    # Incoming transactions were paid for by the sender
+    incoming = {'hash': '0xbb', 'from': '0xsender', 'to': ADDRESS, 'value': '1'}
+    index.add_page([incoming], 'EXTERNAL')
+    assert index.pays_gas(incoming) is False
+
+    # Rows that were never indexed keep their own gas
+    assert index.pays_gas({'hash': '0xcc'}) is True